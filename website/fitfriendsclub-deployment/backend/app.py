@@ -3,27 +3,97 @@ FitFriendsClub Backend API
 A Flask-based backend for the fitness community platform
 
 JWT Implementation: Uses python-jose for enhanced security and JOSE compliance
+Passwords: Argon2id via argon2-cffi; legacy SHA-256 hashes are upgraded on login
 Database: Hybrid SQLite/PostgreSQL system for development/production flexibility
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, abort
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
+import mimetypes
 import sqlite3
+import threading
 import hashlib
+import hmac
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from jose import jwt, JWTError
 import datetime
-from functools import wraps
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 import json
 from werkzeug.utils import secure_filename
-from image_utils import ImageProcessor, save_image_to_disk, delete_image_file
+from image_utils import (
+    ImageProcessor,
+    PIL_BUILD_INFO,
+    save_image_to_disk,
+    delete_image_file,
+)
+
+try:
+    import orjson  # Optional: much faster JSON encoding than the stdlib
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson, matching Flask's default output"""
+
+    def _encode(self, obj):
+        # Sorted keys like Flask's default; datetimes still go through Flask's
+        # default() so they keep the same HTTP-date format
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+
+    def dumps(self, obj, **kwargs):
+        return self._encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+
 
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
 app.config["SECRET_KEY"] = os.environ.get(
     "SECRET_KEY", "fitfriendsclub-secret-key-2025"
 )
 CORS(app)
 
+# Logged at import so it shows up under gunicorn too (once per worker)
+print(f"🖼️  Image processing: {PIL_BUILD_INFO}")
+
+# Image delivery configuration
+# Behind nginx, set IMAGE_ACCEL_REDIRECT_PREFIX (e.g. "/internal-uploads/") so the
+# web server streams files with sendfile(2) instead of copying them through Python.
+# Behind Apache with mod_xsendfile, set USE_X_SENDFILE=true instead.
+UPLOAD_FOLDER = "uploads"
+IMAGE_ACCEL_REDIRECT_PREFIX = os.environ.get("IMAGE_ACCEL_REDIRECT_PREFIX")
+app.config["USE_X_SENDFILE"] = os.environ.get("USE_X_SENDFILE", "").lower() == "true"
+
+# Request bodies above this are rejected with 413 before any handler runs.
+# Sized for the largest endpoint: two max-size images plus form overhead.
+app.config["MAX_CONTENT_LENGTH"] = 2 * ImageProcessor.MAX_FILE_SIZE + 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Heavy image work that the client does not need to wait for
+background_jobs = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image-jobs")
+
+# Jobs die with their worker process (gunicorn recycles workers), leaving
+# their photos 'pending'; after this long, such photos are marked 'failed'
+PENDING_JOB_TIMEOUT_MINUTES = 10
+
 # Database configuration
 DATABASE_PATH = "fitfriendsclub.db"
 DATABASE_URL = os.environ.get("DATABASE_URL", f"sqlite:///{DATABASE_PATH}")
@@ -60,7 +130,44 @@ def get_db_connection():
             port=url.port,
         )
     else:
-        return sqlite3.connect(DATABASE_PATH)
+        return get_sqlite_connection()
+
+
+# One SQLite connection per worker thread, kept open for the thread's lifetime
+_thread_local = threading.local()
+
+
+def get_sqlite_connection():
+    """Get the calling thread's persistent SQLite connection"""
+    conn = getattr(_thread_local, "sqlite_conn", None)
+
+    # Never reuse a connection inherited across fork (gunicorn preload_app)
+    if conn is None or _thread_local.sqlite_pid != os.getpid():
+        conn = sqlite3.connect(DATABASE_PATH)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        _thread_local.sqlite_conn = conn
+        _thread_local.sqlite_pid = os.getpid()
+
+    return conn
+
+
+def release_db_connection(conn):
+    """Release a connection obtained from get_db_connection"""
+    # The thread-local SQLite connection stays open; PostgreSQL ones are closed
+    if conn is not getattr(_thread_local, "sqlite_conn", None):
+        conn.close()
+
+
+@app.teardown_request
+def rollback_open_transaction(exception=None):
+    """Roll back anything a failed request left uncommitted on the shared connection"""
+    conn = getattr(_thread_local, "sqlite_conn", None)
+    if conn is not None and conn.in_transaction:
+        conn.rollback()
 
 
 def init_database():
@@ -173,6 +280,8 @@ def init_postgresql_database():
             photo_type VARCHAR(50) NOT NULL,
             image_path VARCHAR(255) NOT NULL,
             thumbnail_path VARCHAR(255) NOT NULL,
+            status VARCHAR(20) DEFAULT 'ready',
+            content_hash VARCHAR(64),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users (id),
             FOREIGN KEY (workout_id) REFERENCES workouts (id)
@@ -180,6 +289,36 @@ def init_postgresql_database():
     """
     )
 
+    # Columns added after the initial schema
+    cursor.execute(
+        "ALTER TABLE workout_photos "
+        "ADD COLUMN IF NOT EXISTS status VARCHAR(20) DEFAULT 'ready'"
+    )
+    cursor.execute(
+        "ALTER TABLE workout_photos ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)"
+    )
+
+    # Indexes for per-user listing queries (photo gallery, workout history)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_wp_user_created "
+        "ON workout_photos (user_id, created_at DESC)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_workouts_user_date "
+        "ON workouts (user_id, workout_date DESC)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_wp_content_hash "
+        "ON workout_photos (content_hash)"
+    )
+
+    # Fail photos whose background job was lost with a previous process
+    cursor.execute(
+        "UPDATE workout_photos SET status = 'failed' "
+        "WHERE status = 'pending' AND created_at < NOW() - %s * INTERVAL '1 minute'",
+        (PENDING_JOB_TIMEOUT_MINUTES,),
+    )
+
     conn.commit()
     conn.close()
     print("✅ PostgreSQL database initialized successfully!")
@@ -287,6 +426,8 @@ def init_sqlite_database():
             photo_type VARCHAR(50) NOT NULL,
             image_path VARCHAR(255) NOT NULL,
             thumbnail_path VARCHAR(255) NOT NULL,
+            status VARCHAR(20) DEFAULT 'ready',
+            content_hash VARCHAR(64),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users (id),
             FOREIGN KEY (workout_id) REFERENCES workouts (id)
@@ -294,19 +435,75 @@ def init_sqlite_database():
     """
     )
 
+    # Columns added after the initial schema
+    add_column_if_missing(
+        cursor, "workout_photos", "status", "VARCHAR(20) DEFAULT 'ready'"
+    )
+    add_column_if_missing(cursor, "workout_photos", "content_hash", "VARCHAR(64)")
+
+    # Indexes for per-user listing queries (photo gallery, workout history)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_wp_user_created "
+        "ON workout_photos (user_id, created_at DESC)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_workouts_user_date "
+        "ON workouts (user_id, workout_date DESC)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_wp_content_hash "
+        "ON workout_photos (content_hash)"
+    )
+
+    # Fail photos whose background job was lost with a previous process
+    cursor.execute(
+        "UPDATE workout_photos SET status = 'failed' "
+        "WHERE status = 'pending' AND created_at < datetime('now', ?)",
+        (f"-{PENDING_JOB_TIMEOUT_MINUTES} minutes",),
+    )
+
     conn.commit()
     conn.close()
     print("✅ Database initialized successfully!")
 
 
+def add_column_if_missing(cursor, table, column, definition):
+    """Add a column to an existing SQLite table (no ADD COLUMN IF NOT EXISTS)"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+password_hasher = PasswordHasher()
+
+
 def hash_password(password):
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash password using Argon2id"""
+    return password_hasher.hash(password)
+
+
+def is_legacy_password_hash(password_hash):
+    """Check for an unsalted SHA-256 hex digest stored before Argon2"""
+    return len(password_hash) == 64 and not password_hash.startswith("$")
 
 
 def verify_password(password, hash_password):
-    """Verify password against hash"""
-    return hashlib.sha256(password.encode()).hexdigest() == hash_password
+    """Verify password against hash (Argon2 or legacy SHA-256)"""
+    if is_legacy_password_hash(hash_password):
+        legacy_hash = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy_hash, hash_password)
+
+    try:
+        return password_hasher.verify(hash_password, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(password_hash):
+    """Check whether a stored hash should be upgraded to current Argon2 parameters"""
+    if is_legacy_password_hash(password_hash):
+        return True
+    return password_hasher.check_needs_rehash(password_hash)
 
 
 def generate_token(user_id, username):
@@ -321,6 +518,23 @@ def generate_token(user_id, username):
     return jwt.encode(payload, app.config["SECRET_KEY"], algorithm="HS256")
 
 
+@lru_cache(maxsize=1024)
+def _verify_token(token):
+    """Verify a token's signature and claims once per distinct token"""
+    return jwt.decode(token, app.config["SECRET_KEY"], algorithms=["HS256"])
+
+
+def decode_token(token):
+    """Decode a JWT, reusing the verified payload on repeat requests"""
+    data = _verify_token(token)
+
+    # The signature check is cached but expiry must be re-checked every time
+    if data["exp"] < time.time():
+        raise jwt.ExpiredSignatureError("Signature has expired.")
+
+    return data
+
+
 def token_required(f):
     """Decorator to require authentication token"""
 
@@ -335,7 +549,7 @@ def token_required(f):
             token = token[7:]
 
         try:
-            data = jwt.decode(token, app.config["SECRET_KEY"], algorithms=["HS256"])
+            data = decode_token(token)
             current_user_id = data["user_id"]
             current_username = data["username"]
         except jwt.ExpiredSignatureError:
@@ -392,7 +606,7 @@ def register():
         )
         result = cursor.fetchone()
         if result:
-            conn.close()
+            release_db_connection(conn)
             return jsonify({"error": "User already exists"}), 400
 
         # Create new user
@@ -420,7 +634,7 @@ def register():
             (data["username"], data["email"]),
         )
         if cursor.fetchone():
-            conn.close()
+            release_db_connection(conn)
             return jsonify({"error": "User already exists"}), 400
 
         # Create new user
@@ -444,7 +658,7 @@ def register():
         user_id = cursor.lastrowid
 
     conn.commit()
-    conn.close()
+    release_db_connection(conn)
 
     # Generate token
     token = generate_token(user_id, data["username"])
@@ -474,7 +688,7 @@ def login():
     if not data.get("username") or not data.get("password"):
         return jsonify({"error": "Username and password required"}), 400
 
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = get_sqlite_connection()
     cursor = conn.cursor()
 
     cursor.execute(
@@ -482,11 +696,18 @@ def login():
         (data["username"], data["username"]),
     )
     user = cursor.fetchone()
-    conn.close()
 
     if not user or not verify_password(data["password"], user[2]):
         return jsonify({"error": "Invalid credentials"}), 401
 
+    # Transparently migrate legacy SHA-256 hashes to Argon2
+    if password_needs_rehash(user[2]):
+        cursor.execute(
+            "UPDATE users SET password_hash = ? WHERE id = ?",
+            (hash_password(data["password"]), user[0]),
+        )
+        conn.commit()
+
     token = generate_token(user[0], user[1])
 
     return jsonify(
@@ -507,7 +728,7 @@ def login():
 @token_required
 def get_profile(current_user_id, current_username):
     """Get user profile"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = get_sqlite_connection()
     cursor = conn.cursor()
 
     cursor.execute(
@@ -519,7 +740,6 @@ def get_profile(current_user_id, current_username):
     )
 
     user = cursor.fetchone()
-    conn.close()
 
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -543,7 +763,7 @@ def get_profile(current_user_id, current_username):
 @token_required
 def workouts(current_user_id, current_username):
     """Get user workouts or create new workout"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = get_sqlite_connection()
     cursor = conn.cursor()
 
     if request.method == "GET":
@@ -572,7 +792,6 @@ def workouts(current_user_id, current_username):
                 }
             )
 
-        conn.close()
         return jsonify({"workouts": workouts})
 
     elif request.method == "POST":
@@ -602,7 +821,6 @@ def workouts(current_user_id, current_username):
 
         workout_id = cursor.lastrowid
         conn.commit()
-        conn.close()
 
         return (
             jsonify(
@@ -616,7 +834,7 @@ def workouts(current_user_id, current_username):
 @token_required
 def group_workouts(current_user_id, current_username):
     """Get or create group workouts"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = get_sqlite_connection()
     cursor = conn.cursor()
 
     if request.method == "GET":
@@ -650,7 +868,6 @@ def group_workouts(current_user_id, current_username):
                 }
             )
 
-        conn.close()
         return jsonify({"group_workouts": group_workouts})
 
     elif request.method == "POST":
@@ -681,7 +898,6 @@ def group_workouts(current_user_id, current_username):
 
             group_workout_id = cursor.lastrowid
             conn.commit()
-            conn.close()
 
             return (
                 jsonify(
@@ -703,6 +919,49 @@ def group_workouts(current_user_id, current_username):
 # ===================================
 
 
+@app.before_request
+def reject_oversized_request():
+    """Fail fast on oversized uploads, before any of the body is read"""
+    content_length = request.content_length
+    if content_length is not None and content_length > app.config["MAX_CONTENT_LENGTH"]:
+        abort(413)
+
+
+@app.errorhandler(413)
+def request_too_large(error):
+    """Return a JSON error when the request body exceeds MAX_CONTENT_LENGTH"""
+    return jsonify({"error": "Upload too large"}), 413
+
+
+def read_upload(file):
+    """Read an uploaded file into a preallocated buffer
+
+    Returns None without reading any image bytes if the file exceeds
+    ImageProcessor.MAX_FILE_SIZE.
+    """
+    stream = file.stream
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+
+    if size > ImageProcessor.MAX_FILE_SIZE:
+        return None
+
+    buffer = bytearray(size)
+    with memoryview(buffer) as view:
+        offset = 0
+        while offset < size:
+            chunk = stream.read(min(UPLOAD_CHUNK_SIZE, size - offset))
+            if not chunk:
+                break
+            view[offset : offset + len(chunk)] = chunk
+            offset += len(chunk)
+
+    if offset < size:
+        del buffer[offset:]
+    return buffer
+
+
 @app.route("/api/upload-profile-image", methods=["POST"])
 @token_required
 def upload_profile_image(current_user_id, current_username):
@@ -718,15 +977,20 @@ def upload_profile_image(current_user_id, current_username):
             return jsonify({"error": "No image file selected"}), 400
 
         # Read and validate image
-        image_data = file.read()
-        is_valid, message = ImageProcessor.validate_image(image_data)
+        image_data = read_upload(file)
+        if image_data is None:
+            return jsonify({"error": "Image file too large (max 10MB)"}), 413
+
+        # Decode once and render both sizes from the same image
+        is_valid, message, outputs = ImageProcessor.process_upload(
+            image_data, (ImageProcessor.UPLOAD_PROFILE, ImageProcessor.UPLOAD_THUMBNAIL)
+        )
 
         if not is_valid:
             return jsonify({"error": message}), 400
 
-        # Process profile image
-        processed_image = ImageProcessor.resize_profile_image(image_data)
-        thumbnail = ImageProcessor.create_thumbnail(image_data)
+        processed_image = outputs[ImageProcessor.UPLOAD_PROFILE]
+        thumbnail = outputs[ImageProcessor.UPLOAD_THUMBNAIL]
 
         # Generate filenames
         profile_filename = ImageProcessor.generate_filename(current_user_id, "profile")
@@ -742,6 +1006,10 @@ def upload_profile_image(current_user_id, current_username):
         conn = get_db_connection()
         cursor = conn.cursor()
 
+        # Take the write lock before reading, so two concurrent updates can't
+        # both see the same old images (one of them would be orphaned)
+        cursor.execute("BEGIN IMMEDIATE")
+
         # Get old profile image to delete it
         cursor.execute(
             "SELECT profile_image, profile_thumbnail FROM users WHERE id = ?",
@@ -760,13 +1028,13 @@ def upload_profile_image(current_user_id, current_username):
         )
 
         conn.commit()
-        conn.close()
+        release_db_connection(conn)
 
         # Delete old images if they exist
         if old_images and old_images[0]:
-            delete_image_file(os.path.join("uploads", old_images[0]))
+            delete_image_file(os.path.join(UPLOAD_FOLDER, old_images[0]))
         if old_images and old_images[1]:
-            delete_image_file(os.path.join("uploads", old_images[1]))
+            delete_image_file(os.path.join(UPLOAD_FOLDER, old_images[1]))
 
         return jsonify(
             {
@@ -804,52 +1072,86 @@ def upload_workout_photo(current_user_id, current_username):
         )  # workout, progress, before, after
 
         # Read and validate image
-        image_data = file.read()
-        is_valid, message = ImageProcessor.validate_image(image_data)
-
-        if not is_valid:
-            return jsonify({"error": message}), 400
-
-        # Process workout photo
-        processed_image = ImageProcessor.process_workout_photo(
-            image_data, add_watermark
+        image_data = read_upload(file)
+        if image_data is None:
+            return jsonify({"error": "Image file too large (max 10MB)"}), 413
+
+        # Content-addressed filenames: identical uploads from the same user map
+        # to the same files, so a repeat upload skips validation, processing
+        # and disk writes. The user id keeps the names (which are served
+        # without login) from revealing whether anyone else uploaded a photo.
+        content_hash = ImageProcessor.content_digest(image_data)
+        content_key = f"{current_user_id}_{content_hash}"
+        photo_filename = ImageProcessor.content_filename(
+            content_key, "workout_photo" if add_watermark else "workout_photo_plain"
         )
-        thumbnail = ImageProcessor.create_thumbnail(image_data)
-
-        # Generate filenames
-        photo_filename = ImageProcessor.generate_filename(
-            current_user_id, f"{photo_type}_photo"
-        )
-        thumbnail_filename = ImageProcessor.generate_filename(
-            current_user_id, f"{photo_type}_thumb"
+        thumbnail_filename = ImageProcessor.content_filename(
+            content_key, "workout_thumb"
         )
 
-        # Save processed images
-        photo_path = save_image_to_disk(processed_image, photo_filename)
-        thumbnail_path = save_image_to_disk(thumbnail, thumbnail_filename)
-
-        # Save photo record to database
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute(
-            """
-            INSERT INTO workout_photos (user_id, workout_id, photo_type, image_path, 
-                                      thumbnail_path, created_at)
-            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """,
-            (
-                current_user_id,
-                workout_id,
-                photo_type,
-                photo_filename,
-                thumbnail_filename,
-            ),
-        )
+        # Hold the write lock from the exists-check to the INSERT, so a
+        # concurrent delete of a photo sharing these files can't unlink them
+        # before this photo's row references them
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            photo_exists = os.path.exists(os.path.join(UPLOAD_FOLDER, photo_filename))
+            thumbnail_exists = os.path.exists(
+                os.path.join(UPLOAD_FOLDER, thumbnail_filename)
+            )
 
-        photo_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+            if not (photo_exists and thumbnail_exists):
+                # Process whichever outputs aren't stored yet from a single decode
+                kinds = []
+                if not photo_exists:
+                    kinds.append(ImageProcessor.UPLOAD_WORKOUT)
+                if not thumbnail_exists:
+                    kinds.append(ImageProcessor.UPLOAD_THUMBNAIL)
+
+                is_valid, message, outputs = ImageProcessor.process_upload(
+                    image_data, kinds, add_watermark, digest=content_hash
+                )
+
+                if not is_valid:
+                    conn.rollback()
+                    release_db_connection(conn)
+                    return jsonify({"error": message}), 400
+
+                if not photo_exists:
+                    save_image_to_disk(
+                        outputs[ImageProcessor.UPLOAD_WORKOUT], photo_filename
+                    )
+                if not thumbnail_exists:
+                    save_image_to_disk(
+                        outputs[ImageProcessor.UPLOAD_THUMBNAIL], thumbnail_filename
+                    )
+
+            # Save photo record to database
+            cursor.execute(
+                """
+                INSERT INTO workout_photos (user_id, workout_id, photo_type, image_path, 
+                                          thumbnail_path, content_hash, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+                (
+                    current_user_id,
+                    workout_id,
+                    photo_type,
+                    photo_filename,
+                    thumbnail_filename,
+                    content_hash,
+                ),
+            )
+
+            photo_id = cursor.lastrowid
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            release_db_connection(conn)
 
         return jsonify(
             {
@@ -883,21 +1185,20 @@ def create_progress_comparison(current_user_id, current_username):
             return jsonify({"error": "Both image files must be selected"}), 400
 
         # Read and validate images
-        before_data = before_file.read()
-        after_data = after_file.read()
+        before_data = read_upload(before_file)
+        after_data = read_upload(after_file)
 
         for data, name in [(before_data, "before"), (after_data, "after")]:
+            if data is None:
+                return (
+                    jsonify({"error": f"{name.title()} image: too large (max 10MB)"}),
+                    413,
+                )
             is_valid, message = ImageProcessor.validate_image(data)
             if not is_valid:
                 return jsonify({"error": f"{name.title()} image: {message}"}), 400
 
-        # Create comparison image
-        comparison_image = ImageProcessor.create_progress_comparison(
-            before_data, after_data
-        )
-        thumbnail = ImageProcessor.create_thumbnail(comparison_image)
-
-        # Generate filenames
+        # Generate filenames up front so the client knows where the result goes
         comparison_filename = ImageProcessor.generate_filename(
             current_user_id, "progress_comparison"
         )
@@ -905,19 +1206,15 @@ def create_progress_comparison(current_user_id, current_username):
             current_user_id, "progress_thumb"
         )
 
-        # Save images
-        comparison_path = save_image_to_disk(comparison_image, comparison_filename)
-        thumbnail_path = save_image_to_disk(thumbnail, thumbnail_filename)
-
-        # Save record to database
+        # Record a pending photo now; the images are rendered in the background
         conn = get_db_connection()
         cursor = conn.cursor()
 
         cursor.execute(
             """
             INSERT INTO workout_photos (user_id, photo_type, image_path, 
-                                      thumbnail_path, created_at)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                                      thumbnail_path, status, created_at)
+            VALUES (?, ?, ?, ?, 'pending', CURRENT_TIMESTAMP)
         """,
             (
                 current_user_id,
@@ -929,16 +1226,29 @@ def create_progress_comparison(current_user_id, current_username):
 
         comparison_id = cursor.lastrowid
         conn.commit()
-        conn.close()
+        release_db_connection(conn)
+
+        background_jobs.submit(
+            build_progress_comparison,
+            comparison_id,
+            before_data,
+            after_data,
+            comparison_filename,
+            thumbnail_filename,
+        )
 
-        return jsonify(
-            {
-                "success": True,
-                "message": "Progress comparison created successfully",
-                "comparison_id": comparison_id,
-                "image_path": comparison_filename,
-                "thumbnail": thumbnail_filename,
-            }
+        return (
+            jsonify(
+                {
+                    "success": True,
+                    "status": "processing",
+                    "message": "Progress comparison is being created",
+                    "comparison_id": comparison_id,
+                    "image_path": comparison_filename,
+                    "thumbnail": thumbnail_filename,
+                }
+            ),
+            202,
         )
 
     except Exception as e:
@@ -946,13 +1256,110 @@ def create_progress_comparison(current_user_id, current_username):
         return jsonify({"error": "Failed to create progress comparison"}), 500
 
 
+def build_progress_comparison(
+    comparison_id, before_data, after_data, comparison_filename, thumbnail_filename
+):
+    """Background job: render a progress comparison and mark its photo ready"""
+    status = "ready"
+    try:
+        comparison_image = ImageProcessor.create_progress_comparison(
+            before_data, after_data
+        )
+        thumbnail = ImageProcessor.create_thumbnail(comparison_image)
+
+        save_image_to_disk(comparison_image, comparison_filename)
+        save_image_to_disk(thumbnail, thumbnail_filename)
+
+    except Exception as e:
+        print(f"Error creating progress comparison {comparison_id}: {str(e)}")
+        status = "failed"
+
+    # Nothing reads this job's future, so errors must be logged here
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE workout_photos SET status = ? WHERE id = ?", (status, comparison_id)
+        )
+        photo_deleted = cursor.rowcount == 0
+        conn.commit()
+    except Exception as e:
+        print(f"Error updating progress comparison {comparison_id}: {str(e)}")
+        if conn is not None:
+            conn.rollback()
+        return
+    finally:
+        if conn is not None:
+            release_db_connection(conn)
+
+    # The photo was deleted while rendering; don't leave orphaned files behind
+    if photo_deleted:
+        delete_image_file(os.path.join(UPLOAD_FOLDER, comparison_filename))
+        delete_image_file(os.path.join(UPLOAD_FOLDER, thumbnail_filename))
+
+
+@app.route("/api/photo-status/<int:photo_id>")
+@token_required
+def get_photo_status(current_user_id, current_username, photo_id):
+    """Get processing status of a photo (pending, ready or failed)"""
+    try:
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            SELECT status, created_at < datetime('now', ?) FROM workout_photos
+            WHERE id = ? AND user_id = ?
+        """,
+            (f"-{PENDING_JOB_TIMEOUT_MINUTES} minutes", photo_id, current_user_id),
+        )
+        photo = cursor.fetchone()
+
+        if not photo:
+            release_db_connection(conn)
+            return jsonify({"error": "Photo not found or access denied"}), 404
+
+        # The job was lost with its worker (startup only sweeps on a restart);
+        # report it failed so clients stop polling
+        status = photo[0]
+        if status == "pending" and photo[1]:
+            status = "failed"
+            cursor.execute(
+                "UPDATE workout_photos SET status = 'failed' "
+                "WHERE id = ? AND status = 'pending'",
+                (photo_id,),
+            )
+            conn.commit()
+        release_db_connection(conn)
+
+        return jsonify({"success": True, "photo_id": photo_id, "status": status})
+
+    except Exception as e:
+        print(f"Error getting photo status: {str(e)}")
+        return jsonify({"error": "Failed to retrieve photo status"}), 500
+
+
 @app.route("/api/images/<filename>")
 def serve_image(filename):
     """Serve uploaded images"""
     try:
         # Security check: ensure filename is safe
         safe_filename = secure_filename(filename)
-        return send_from_directory("uploads", safe_filename)
+
+        if IMAGE_ACCEL_REDIRECT_PREFIX:
+            # Let nginx serve the bytes from its internal location
+            response = app.response_class()
+            response.headers["X-Accel-Redirect"] = (
+                f"{IMAGE_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{safe_filename}"
+            )
+            response.headers["Content-Type"] = (
+                mimetypes.guess_type(safe_filename)[0] or "application/octet-stream"
+            )
+            return response
+
+        return send_from_directory(UPLOAD_FOLDER, safe_filename)
 
     except Exception as e:
         print(f"Error serving image: {str(e)}")
@@ -972,26 +1379,25 @@ def get_user_photos(current_user_id, current_username):
             """
             SELECT id, workout_id, photo_type, image_path, thumbnail_path, created_at
             FROM workout_photos 
-            WHERE user_id = ?
+            WHERE user_id = ? AND status = 'ready'
             ORDER BY created_at DESC
         """,
             (current_user_id,),
         )
 
-        photos = []
-        for row in cursor.fetchall():
-            photos.append(
-                {
-                    "id": row[0],
-                    "workout_id": row[1],
-                    "photo_type": row[2],
-                    "image_url": f"/api/images/{row[3]}",
-                    "thumbnail_url": f"/api/images/{row[4]}",
-                    "created_at": row[5],
-                }
-            )
+        photos = [
+            {
+                "id": row["id"],
+                "workout_id": row["workout_id"],
+                "photo_type": row["photo_type"],
+                "image_url": f"/api/images/{row['image_path']}",
+                "thumbnail_url": f"/api/images/{row['thumbnail_path']}",
+                "created_at": row["created_at"],
+            }
+            for row in cursor.fetchall()
+        ]
 
-        conn.close()
+        release_db_connection(conn)
 
         return jsonify({"success": True, "photos": photos})
 
@@ -1000,6 +1406,19 @@ def get_user_photos(current_user_id, current_username):
         return jsonify({"error": "Failed to retrieve photos"}), 500
 
 
+def image_file_in_use(cursor, content_hash, filename):
+    """Check whether any remaining photo still references a content-addressed file"""
+    cursor.execute(
+        """
+        SELECT 1 FROM workout_photos
+        WHERE content_hash = ? AND (image_path = ? OR thumbnail_path = ?)
+        LIMIT 1
+    """,
+        (content_hash, filename, filename),
+    )
+    return cursor.fetchone() is not None
+
+
 @app.route("/api/delete-photo/<int:photo_id>", methods=["DELETE"])
 @token_required
 def delete_photo(current_user_id, current_username, photo_id):
@@ -1009,31 +1428,44 @@ def delete_photo(current_user_id, current_username, photo_id):
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Get photo info and verify ownership
-        cursor.execute(
-            """
-            SELECT image_path, thumbnail_path FROM workout_photos 
-            WHERE id = ? AND user_id = ?
-        """,
-            (photo_id, current_user_id),
-        )
+        # Keep the write lock until the files are gone, so an upload of the
+        # same content can't check that a shared file exists, then have it
+        # unlinked here before its row is inserted
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Get photo info and verify ownership
+            cursor.execute(
+                """
+                SELECT image_path, thumbnail_path, content_hash FROM workout_photos 
+                WHERE id = ? AND user_id = ?
+            """,
+                (photo_id, current_user_id),
+            )
 
-        photo_info = cursor.fetchone()
-        if not photo_info:
-            return jsonify({"error": "Photo not found or access denied"}), 404
+            photo_info = cursor.fetchone()
+            if not photo_info:
+                conn.rollback()
+                return jsonify({"error": "Photo not found or access denied"}), 404
 
-        # Delete from database
-        cursor.execute(
-            "DELETE FROM workout_photos WHERE id = ? AND user_id = ?",
-            (photo_id, current_user_id),
-        )
+            # Delete from database
+            cursor.execute(
+                "DELETE FROM workout_photos WHERE id = ? AND user_id = ?",
+                (photo_id, current_user_id),
+            )
 
-        conn.commit()
-        conn.close()
+            # Content-addressed files may be shared with other photos; keep those
+            for filename in (photo_info[0], photo_info[1]):
+                if not photo_info[2] or not image_file_in_use(
+                    cursor, photo_info[2], filename
+                ):
+                    delete_image_file(os.path.join(UPLOAD_FOLDER, filename))
 
-        # Delete files from disk
-        delete_image_file(os.path.join("uploads", photo_info[0]))
-        delete_image_file(os.path.join("uploads", photo_info[1]))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            release_db_connection(conn)
 
         return jsonify({"success": True, "message": "Photo deleted successfully"})
 
@@ -3,11 +3,147 @@ FitFriendsClub Image Processing Utilities
 Handles profile pictures, workout photos, and fitness progress images
 """
 
-from PIL import Image, ImageOps, ImageDraw, ImageFont
+import PIL
+from PIL import Image, ImageOps, ImageDraw, ImageFont, features
+import numpy as np
 import io
+import mmap
 import os
+import threading
 import hashlib
-from datetime import datetime
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import cv2  # Optional: SIMD resize kernels, much faster than Pillow's
+
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# Opt-in: crop, resize and encode RGB profile pictures entirely in OpenCV,
+# skipping Pillow after decode (FAST_PROFILE_PATH=true; for quality A/B)
+FAST_PROFILE_PATH = os.environ.get("FAST_PROFILE_PATH", "false").lower() == "true"
+
+# Pillow-SIMD is a drop-in Pillow build with SSE4/AVX2 resampling kernels;
+# its releases carry a ".postN" version suffix
+PILLOW_SIMD = ".post" in PIL.__version__
+# Official Pillow wheels bundle libjpeg-turbo (SIMD DCT and Huffman coding)
+JPEG_TURBO = bool(features.check_feature("libjpeg_turbo"))
+PIL_BUILD_INFO = (
+    f"Pillow {PIL.__version__} ({'SIMD' if PILLOW_SIMD else 'standard'} build, "
+    f"{'libjpeg-turbo' if JPEG_TURBO else 'libjpeg'})"
+)
+
+# Per-thread reusable encode buffer; ones grown past the limit are dropped
+_encode_buffers = threading.local()
+ENCODE_BUFFER_LIMIT = 4 * 1024 * 1024
+
+
+class _RenderCache:
+    """Thread-safe LRU of rendered JPEG bytes, bounded by total size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+# Pillow releases the GIL while decoding and resampling, so independent
+# images (e.g. both sides of a progress comparison) are resized in parallel
+_resize_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 2, thread_name_prefix="image-resize"
+)
+
+# Outputs of process_upload keyed on a digest of the upload, so re-uploading
+# the same photo skips decoding and resizing (per worker process)
+_rendered_uploads = _RenderCache(32 * 1024 * 1024)
+
+
+def _load_font(size):
+    """Load Arial at the given size, falling back to Pillow's default font"""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except (OSError, IOError):
+        return ImageFont.load_default()
+
+
+def _render_text(text, font, fill, padding=0, background=None):
+    """Render text into an RGBA patch, optionally on a padded background box
+
+    The patch pastes at the position draw.text would have been given, less
+    padding. Returns (patch, (text_width, text_height)).
+    """
+    bbox = font.getbbox(text)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+
+    patch = Image.new(
+        "RGBA",
+        (
+            max(text_width, bbox[2]) + 2 * padding + 1,
+            max(text_height, bbox[3]) + 2 * padding + 1,
+        ),
+        (0, 0, 0, 0),
+    )
+    draw = ImageDraw.Draw(patch)
+    if background is not None:
+        draw.rectangle(
+            [0, 0, text_width + 2 * padding, text_height + 2 * padding],
+            fill=background,
+        )
+    draw.text((padding, padding), text, font=font, fill=fill)
+    return patch, (text_width, text_height)
+
+
+def _split_alpha(patch):
+    """Split an RGBA patch into an RGB source and an L mask for paste()
+
+    Pasting RGB through an L mask is Pillow's plain blend loop, with no
+    per-call RGBA handling on the RGB destinations used here.
+    """
+    return patch.convert("RGB"), patch.getchannel("A")
+
+
+# Fonts and text overlays are static, so load and render them once
+_LABEL_FONT = _load_font(16)
+_watermark, _WATERMARK_TEXT_SIZE = _render_text(
+    "FitFriendsClub",
+    _load_font(20),
+    fill=(255, 255, 255, 200),
+    padding=5,
+    background=(0, 0, 0, 100),
+)
+_WATERMARK, _WATERMARK_MASK = _split_alpha(_watermark)
+_BEFORE_LABEL, _BEFORE_MASK = _split_alpha(
+    _render_text("BEFORE", _LABEL_FONT, fill=(0, 0, 0))[0]
+)
+_AFTER_LABEL, _AFTER_MASK = _split_alpha(
+    _render_text("AFTER", _LABEL_FONT, fill=(0, 0, 0))[0]
+)
 
 
 class ImageProcessor:
@@ -23,12 +159,116 @@ class ImageProcessor:
     SUPPORTED_FORMATS = {"JPEG", "JPG", "PNG", "WEBP", "BMP"}
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
+    # Output kinds for process_upload
+    UPLOAD_PROFILE = "profile"
+    UPLOAD_THUMBNAIL = "thumbnail"
+    UPLOAD_WORKOUT = "workout"
+    UPLOAD_SIZES = {
+        UPLOAD_PROFILE: PROFILE_SIZE,
+        UPLOAD_THUMBNAIL: THUMBNAIL_SIZE,
+        UPLOAD_WORKOUT: WORKOUT_PHOTO_SIZE,
+    }
+
     @staticmethod
     def validate_image(image_data):
         """Validate uploaded image data"""
+        is_valid, message, _ = ImageProcessor._open_upload(image_data)
+        return is_valid, message
+
+    @staticmethod
+    def process_upload(image_data, kinds, add_watermark=True, digest=None):
+        """Validate an upload and render each requested kind from one decode
+
+        Pass digest when the caller already has content_digest(image_data).
+        Returns (is_valid, message, {kind: jpeg_bytes}).
+        """
+        # Repeat uploads of the same bytes are served from the render cache;
+        # only valid images are ever cached
+        if digest is None:
+            digest = ImageProcessor.content_digest(image_data)
+        keys = {
+            kind: (
+                digest,
+                kind,
+                add_watermark and kind == ImageProcessor.UPLOAD_WORKOUT,
+            )
+            for kind in kinds
+        }
+        outputs = {}
+        for kind in kinds:
+            cached = _rendered_uploads.get(keys[kind])
+            if cached is not None:
+                outputs[kind] = cached
+        missing = [kind for kind in kinds if kind not in outputs]
+        if not missing:
+            return True, "Valid image", outputs
+
+        is_valid, message, image = ImageProcessor._open_upload(image_data)
+        if not is_valid:
+            return False, message, {}
+
+        sizes = [ImageProcessor.UPLOAD_SIZES.get(kind, (0, 0)) for kind in missing]
+        ImageProcessor._draft(
+            image, (max(w for w, _ in sizes), max(h for _, h in sizes))
+        )
+
+        try:
+            image.load()
+        except Exception as e:
+            return False, f"Invalid image file: {str(e)}", {}
+
+        for kind in missing:
+            if kind == ImageProcessor.UPLOAD_PROFILE:
+                outputs[kind] = ImageProcessor._resize_profile(image)
+            elif kind == ImageProcessor.UPLOAD_THUMBNAIL:
+                outputs[kind] = ImageProcessor._thumbnail(image)
+            elif kind == ImageProcessor.UPLOAD_WORKOUT:
+                outputs[kind] = ImageProcessor._workout(image, add_watermark)
+            else:
+                raise ValueError(f"Unknown upload kind: {kind}")
+            _rendered_uploads.put(keys[kind], outputs[kind])
+        return True, "Valid image", outputs
+
+    @staticmethod
+    def resize_profile_image(image_data, size=None):
+        """Resize and optimize profile picture"""
+        image = Image.open(io.BytesIO(image_data))
+        ImageProcessor._draft(image, size or ImageProcessor.PROFILE_SIZE)
+        return ImageProcessor._resize_profile(image, size)
+
+    @staticmethod
+    def create_thumbnail(image_data, size=None):
+        """Create thumbnail from image"""
+        image = Image.open(io.BytesIO(image_data))
+        ImageProcessor._draft(image, size or ImageProcessor.THUMBNAIL_SIZE)
+        return ImageProcessor._thumbnail(image, size)
+
+    @staticmethod
+    def process_workout_photo(image_data, add_watermark=True):
+        """Process workout/progress photos"""
+        image = Image.open(io.BytesIO(image_data))
+        ImageProcessor._draft(image, ImageProcessor.WORKOUT_PHOTO_SIZE)
+        return ImageProcessor._workout(image, add_watermark)
+
+    @staticmethod
+    def _draft(image, size):
+        """Have libjpeg decode at the smallest DCT scale still >= 2x size
+
+        The 2x headroom keeps the final LANCZOS pass at full quality, as
+        Pillow's reducing_gap does. A no-op for anything but JPEG.
+        """
+        image.draft("RGB", (size[0] * 2, size[1] * 2))
+
+    @staticmethod
+    def _open_upload(image_data):
+        """Open image data and check its size, format and dimensions
+
+        Only the header is parsed; pixel data is decoded on first use.
+        Returns (is_valid, message, image).
+        """
         try:
             if len(image_data) > ImageProcessor.MAX_FILE_SIZE:
-                return False, "Image file too large (max 10MB)"
+                return False, "Image file too large (max 10MB)", None
 
             image = Image.open(io.BytesIO(image_data))
 
@@ -36,55 +276,64 @@ class ImageProcessor:
                 return (
                     False,
                     f"Unsupported format. Use: {', '.join(ImageProcessor.SUPPORTED_FORMATS)}",
+                    None,
                 )
 
             # Check image dimensions (prevent extremely large images)
             if image.width > 4000 or image.height > 4000:
-                return False, "Image dimensions too large (max 4000x4000)"
+                return False, "Image dimensions too large (max 4000x4000)", None
 
-            return True, "Valid image"
+            return True, "Valid image", image
 
         except Exception as e:
-            return False, f"Invalid image file: {str(e)}"
+            return False, f"Invalid image file: {str(e)}", None
 
     @staticmethod
-    def resize_profile_image(image_data, size=None):
-        """Resize and optimize profile picture"""
+    def _resize_profile(image, size=None):
+        """Crop and encode an opened image as a profile picture"""
         if size is None:
             size = ImageProcessor.PROFILE_SIZE
 
         try:
-            image = Image.open(io.BytesIO(image_data))
-
             # Convert to RGB if necessary (handles RGBA, P, etc.)
             if image.mode not in ("RGB", "L"):
                 image = image.convert("RGB")
 
+            if (
+                FAST_PROFILE_PATH
+                and CV2_AVAILABLE
+                and image.mode == "RGB"
+                and image.width >= size[0]
+                and image.height >= size[1]
+            ):
+                return ImageProcessor._fast_profile(image, size)
+
             # Create square crop from center
-            image = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+            image = ImageProcessor._fit(image, size)
 
             # Optimize and save
-            output = io.BytesIO()
-            image.save(output, format="JPEG", quality=85, optimize=True)
-            return output.getvalue()
+            return ImageProcessor._encode_jpeg(image, quality=85)
 
         except Exception as e:
             raise ValueError(f"Error processing profile image: {str(e)}")
 
     @staticmethod
-    def create_thumbnail(image_data, size=None):
-        """Create thumbnail from image"""
+    def _thumbnail(image, size=None):
+        """Encode an opened image as a square thumbnail"""
         if size is None:
             size = ImageProcessor.THUMBNAIL_SIZE
 
         try:
-            image = Image.open(io.BytesIO(image_data))
-
-            # Convert to RGB if necessary
+            # Convert to RGB if necessary; otherwise copy, since thumbnail()
+            # works in place and the caller may render other kinds from image
             if image.mode not in ("RGB", "L"):
                 image = image.convert("RGB")
+            else:
+                image = image.copy()
 
-            # Create thumbnail maintaining aspect ratio
+            # Create thumbnail maintaining aspect ratio. Not ImageOps.pad: it
+            # resizes without reducing_gap (2-4x slower from large sources),
+            # upscales small images and can't fill L images with an RGB color
             image.thumbnail(size, Image.Resampling.LANCZOS)
 
             # Center on square background
@@ -93,21 +342,20 @@ class ImageProcessor:
             y = (size[1] - image.height) // 2
             background.paste(image, (x, y))
 
-            output = io.BytesIO()
-            background.save(output, format="JPEG", quality=80, optimize=True)
-            return output.getvalue()
+            return ImageProcessor._encode_jpeg(background, quality=80)
 
         except Exception as e:
             raise ValueError(f"Error creating thumbnail: {str(e)}")
 
     @staticmethod
-    def process_workout_photo(image_data, add_watermark=True):
-        """Process workout/progress photos"""
+    def _workout(image, add_watermark=True):
+        """Downscale, watermark and encode an opened workout photo"""
         try:
-            image = Image.open(io.BytesIO(image_data))
+            original = image
 
-            # Convert to RGB if necessary
-            if image.mode != "RGB":
+            # Convert to RGB if necessary; greyscale is resized first and
+            # converted afterwards, on a third of the data
+            if image.mode not in ("RGB", "L"):
                 image = image.convert("RGB")
 
             # Resize if too large while maintaining aspect ratio
@@ -115,62 +363,128 @@ class ImageProcessor:
                 image.width > ImageProcessor.WORKOUT_PHOTO_SIZE[0]
                 or image.height > ImageProcessor.WORKOUT_PHOTO_SIZE[1]
             ):
-                image.thumbnail(
-                    ImageProcessor.WORKOUT_PHOTO_SIZE, Image.Resampling.LANCZOS
+                image = ImageProcessor._shrink_to_fit(
+                    image, ImageProcessor.WORKOUT_PHOTO_SIZE
                 )
 
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+
             # Add watermark if requested
             if add_watermark:
+                # The watermark is drawn in place; don't touch the caller's image
+                if image is original:
+                    image = image.copy()
                 image = ImageProcessor._add_watermark(image)
 
             # Optimize and save
-            output = io.BytesIO()
-            image.save(output, format="JPEG", quality=85, optimize=True)
-            return output.getvalue()
+            return ImageProcessor._encode_jpeg(image, quality=85)
 
         except Exception as e:
             raise ValueError(f"Error processing workout photo: {str(e)}")
 
+    @staticmethod
+    def _encode_jpeg(image, quality, subsampling="4:2:0"):
+        """Encode image as an optimized progressive JPEG"""
+        # Rewind rather than truncate: truncate(0) releases the backing
+        # storage, while stale bytes past tell() are never read
+        output = getattr(_encode_buffers, "output", None) or io.BytesIO()
+        _encode_buffers.output = None
+        output.seek(0)
+        # Pin 4:2:0 chroma subsampling rather than relying on encoder defaults
+        image.save(
+            output,
+            format="JPEG",
+            quality=quality,
+            subsampling=subsampling,
+            optimize=True,
+            progressive=True,
+        )
+        size = output.tell()
+        with output.getbuffer() as view:
+            data = view[:size].tobytes()
+        if size <= ENCODE_BUFFER_LIMIT:
+            _encode_buffers.output = output
+        return data
+
+    @staticmethod
+    def _fit(image, size):
+        """Center-crop image to the aspect ratio of size and resize to it"""
+        if not CV2_AVAILABLE:
+            return ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+
+        # np.asarray copies the decoded pixels once; the crop is a slice of
+        # that copy, then OpenCV resamples it
+        pixels = ImageProcessor._center_crop(np.asarray(image), size)
+        return ImageProcessor._cv2_resize(pixels, size)
+
+    @staticmethod
+    def _center_crop(pixels, size):
+        """Slice the centered region of pixels with the aspect ratio of size"""
+        height, width = pixels.shape[:2]
+        target_ratio = size[0] / size[1]
+        if width / height > target_ratio:
+            crop_width = round(height * target_ratio)
+            left = (width - crop_width) // 2
+            return pixels[:, left : left + crop_width]
+        crop_height = round(width / target_ratio)
+        top = (height - crop_height) // 2
+        return pixels[top : top + crop_height]
+
+    @staticmethod
+    def _fast_profile(image, size):
+        """Crop, downscale and JPEG-encode an RGB image with OpenCV alone"""
+        pixels = ImageProcessor._center_crop(np.asarray(image), size)
+        pixels = cv2.resize(pixels, size, interpolation=cv2.INTER_AREA)
+        ok, encoded = cv2.imencode(
+            ".jpg",
+            cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR),
+            [
+                cv2.IMWRITE_JPEG_QUALITY,
+                85,
+                cv2.IMWRITE_JPEG_OPTIMIZE,
+                1,
+                cv2.IMWRITE_JPEG_PROGRESSIVE,
+                1,
+            ],
+        )
+        if not ok:
+            raise ValueError("OpenCV could not encode the image")
+        return encoded.tobytes()
+
+    @staticmethod
+    def _shrink_to_fit(image, max_size):
+        """Downscale image to fit within max_size, preserving aspect ratio"""
+        if not CV2_AVAILABLE:
+            # thumbnail() works in place; keep the caller's image intact
+            image = image.copy()
+            image.thumbnail(max_size, Image.Resampling.LANCZOS)
+            return image
+
+        ratio = min(max_size[0] / image.width, max_size[1] / image.height)
+        size = (max(1, round(image.width * ratio)), max(1, round(image.height * ratio)))
+        return ImageProcessor._cv2_resize(np.asarray(image), size)
+
+    @staticmethod
+    def _cv2_resize(pixels, size):
+        """Resize a pixel array with OpenCV and wrap it back into an Image"""
+        # INTER_AREA is the right filter for downscaling, INTER_CUBIC for upscaling
+        if size[0] <= pixels.shape[1] and size[1] <= pixels.shape[0]:
+            interpolation = cv2.INTER_AREA
+        else:
+            interpolation = cv2.INTER_CUBIC
+        return Image.fromarray(cv2.resize(pixels, size, interpolation=interpolation))
+
     @staticmethod
     def _add_watermark(image):
         """Add FitFriendsClub watermark to image"""
         try:
-            # Create watermark
-            watermark = Image.new("RGBA", image.size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(watermark)
-
-            # Calculate text size and position
-            text = "FitFriendsClub"
-
-            try:
-                # Try to use a better font if available
-                font = ImageFont.truetype("arial.ttf", 20)
-            except (OSError, IOError):
-                # Fall back to default font
-                font = ImageFont.load_default()
-
-            # Get text bounding box
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-
-            # Position watermark in bottom-right corner
+            # Blend the pre-rendered patch into the bottom-right corner, in place
+            text_width, text_height = _WATERMARK_TEXT_SIZE
             x = image.width - text_width - 20
             y = image.height - text_height - 20
-
-            # Draw text with semi-transparent background
-            draw.rectangle(
-                [x - 5, y - 5, x + text_width + 5, y + text_height + 5],
-                fill=(0, 0, 0, 100),
-            )
-            draw.text((x, y), text, font=font, fill=(255, 255, 255, 200))
-
-            # Composite watermark onto image
-            if image.mode != "RGBA":
-                image = image.convert("RGBA")
-
-            watermarked = Image.alpha_composite(image, watermark)
-            return watermarked.convert("RGB")
+            image.paste(_WATERMARK, (x - 5, y - 5), _WATERMARK_MASK)
+            return image
 
         except Exception as e:
             # If watermarking fails, return original image
@@ -180,9 +494,19 @@ class ImageProcessor:
     @staticmethod
     def generate_filename(user_id, image_type="image"):
         """Generate unique filename for uploaded image"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        random_hash = hashlib.md5(f"{user_id}_{timestamp}".encode()).hexdigest()[:8]
-        return f"{image_type}_{user_id}_{timestamp}_{random_hash}.jpg"
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        random_suffix = os.urandom(4).hex()
+        return f"{image_type}_{user_id}_{timestamp}_{random_suffix}.jpg"
+
+    @staticmethod
+    def content_digest(image_data):
+        """SHA-256 hex digest of raw upload bytes"""
+        return hashlib.sha256(image_data).hexdigest()
+
+    @staticmethod
+    def content_filename(digest, image_type="image"):
+        """Content-addressed filename for an image derived from an upload"""
+        return f"{image_type}_{digest}.jpg"
 
     @staticmethod
     def create_progress_comparison(before_image_data, after_image_data):
@@ -199,12 +523,14 @@ class ImageProcessor:
             before_width = int(before_img.width * before_ratio)
             after_width = int(after_img.width * after_ratio)
 
-            before_resized = before_img.resize(
-                (before_width, target_height), Image.Resampling.LANCZOS
+            # Decode and resize the two sides concurrently
+            before_future = _resize_pool.submit(
+                ImageProcessor._panel, before_img, (before_width, target_height)
             )
-            after_resized = after_img.resize(
-                (after_width, target_height), Image.Resampling.LANCZOS
+            after_resized = ImageProcessor._panel(
+                after_img, (after_width, target_height)
             )
+            before_resized = before_future.result()
 
             # Create comparison image
             total_width = before_width + after_width + 20  # 20px gap
@@ -216,36 +542,33 @@ class ImageProcessor:
             comparison.paste(before_resized, (0, 30))
             comparison.paste(after_resized, (before_width + 20, 30))
 
-            # Add labels
-            draw = ImageDraw.Draw(comparison)
-            try:
-                font = ImageFont.truetype("arial.ttf", 16)
-            except (OSError, IOError):
-                font = ImageFont.load_default()
-
-            draw.text((before_width // 2 - 25, 5), "BEFORE", font=font, fill=(0, 0, 0))
-            draw.text(
-                (before_width + 20 + after_width // 2 - 20, 5),
-                "AFTER",
-                font=font,
-                fill=(0, 0, 0),
+            # Add separator line (2px, centred in the gap)
+            line_x = before_width + 10
+            comparison.paste(
+                (200, 200, 200), (line_x, 0, line_x + 2, comparison.height)
             )
 
-            # Add separator line
-            line_x = before_width + 10
-            draw.line(
-                [(line_x, 0), (line_x, target_height + 60)],
-                fill=(200, 200, 200),
-                width=2,
+            # Add labels
+            comparison.paste(_BEFORE_LABEL, (before_width // 2 - 25, 5), _BEFORE_MASK)
+            comparison.paste(
+                _AFTER_LABEL,
+                (before_width + 20 + after_width // 2 - 20, 5),
+                _AFTER_MASK,
             )
 
-            output = io.BytesIO()
-            comparison.save(output, format="JPEG", quality=90, optimize=True)
-            return output.getvalue()
+            return ImageProcessor._encode_jpeg(comparison, quality=90)
 
         except Exception as e:
             raise ValueError(f"Error creating progress comparison: {str(e)}")
 
+    @staticmethod
+    def _panel(image, size):
+        """Decode and resize one side of a progress comparison to an RGB panel"""
+        # Decode JPEGs at a reduced DCT scale first, so LANCZOS only runs
+        # over ~2x the panel size rather than the camera-sized source
+        ImageProcessor._draft(image, size)
+        return image.resize(size, Image.Resampling.LANCZOS).convert("RGB")
+
 
 def save_image_to_disk(image_data, filename, upload_dir="uploads"):
     """Save processed image to disk"""
@@ -253,10 +576,19 @@ def save_image_to_disk(image_data, filename, upload_dir="uploads"):
         # Create upload directory if it doesn't exist
         os.makedirs(upload_dir, exist_ok=True)
 
-        # Save file
+        # Save file via a temporary name so readers never see a partial image
         filepath = os.path.join(upload_dir, filename)
-        with open(filepath, "wb") as f:
-            f.write(image_data)
+        temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # Unbuffered write: the JPEG is already in memory, so the buffered
+        # writer would only add a copy
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            view = memoryview(image_data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+        os.replace(temp_path, filepath)
 
         return filepath
 
@@ -264,6 +596,29 @@ def save_image_to_disk(image_data, filename, upload_dir="uploads"):
         raise IOError(f"Error saving image: {str(e)}")
 
 
+@contextmanager
+def load_image_mmap(filepath):
+    """Open a stored image through a read-only memory map of the file
+
+    Use as a context manager; the image and the map are closed on exit, so
+    call image.load() or copy() inside the block to keep the pixels.
+    """
+    # Pillow reads straight from the page cache; the map holds its own
+    # reference to the file, so the descriptor can be closed right away.
+    # An empty file can't be mapped, and Pillow rejects it like any other
+    # unreadable image either way.
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            source = io.BytesIO()
+        else:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        with Image.open(source) as image:
+            yield image
+    finally:
+        source.close()
+
+
 def delete_image_file(filepath):
     """Delete image file from disk"""
     try:
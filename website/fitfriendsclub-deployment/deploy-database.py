@@ -5,6 +5,7 @@ Alternative deployment method using Python and psycopg2
 """
 
 import os
+import re
 import sys
 from pathlib import Path
 
@@ -19,6 +20,9 @@ except ImportError:
     print("   conda install psycopg2")
     sys.exit(1)
 
+# user:password@ credentials in a connection URL
+_URL_PW_RE = re.compile(r'(://[^:/@]+:)[^@]+(@)')
+
 def log(message, color=None):
     """Print colored log messages"""
     colors = {
@@ -61,14 +65,7 @@ def deploy_database():
         sys.exit(1)
 
     # Hide password in log
-    safe_url = database_url
-    if '://' in database_url and '@' in database_url:
-        parts = database_url.split('@')
-        if len(parts) == 2:
-            prefix = parts[0].split('://')
-            if len(prefix) == 2 and ':' in prefix[1]:
-                user_pass = prefix[1].split(':')
-                safe_url = f"{prefix[0]}://{user_pass[0]}:****@{parts[1]}"
+    safe_url = _URL_PW_RE.sub(r'\1****\2', database_url)
 
     log('📊 Database Connection:', 'yellow')
     print(f'  URL: {safe_url}')
@@ -82,10 +79,10 @@ def deploy_database():
         print("Make sure you're running this script from the correct directory.")
         sys.exit(1)
 
-    # Read schema file
+    # Read schema file as raw bytes; psycopg2 sends a bytes query as-is
+    # instead of decoding it here and re-encoding it on execute
     try:
-        with open(schema_path, 'r', encoding='utf-8') as f:
-            schema_content = f.read()
+        schema_content = schema_path.read_bytes()
     except Exception as e:
         log('❌ ERROR: Could not read schema file', 'red')
         print(f'Error: {e}')
@@ -127,7 +124,9 @@ def deploy_database():
         log('🚀 Starting database deployment...', 'blue')
         print()
 
-        # Execute schema
+        # Execute schema in one round trip and one transaction (psycopg2's
+        # default, already opened by the connection test), so a failure
+        # part-way through leaves the database untouched
         log('📊 Executing SQL schema...', 'yellow')
         cursor.execute(schema_content)
         conn.commit()
@@ -138,17 +137,7 @@ def deploy_database():
         # Verify deployment
         log('🔍 Verifying deployment...', 'yellow')
         
-        cursor.execute("""
-            SELECT COUNT(*) as count 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            AND table_type = 'BASE TABLE'
-        """)
-        
-        table_count = cursor.fetchone()[0]
-        print(f'  Tables created: {table_count}')
-        
-        # List tables
+        # One catalog query; the count is just the number of rows
         cursor.execute("""
             SELECT table_name 
             FROM information_schema.tables 
@@ -158,7 +147,9 @@ def deploy_database():
         """)
         
         tables = cursor.fetchall()
+        print(f'  Tables created: {len(tables)}')
         
+        # List tables
         print()
         log('📋 Created Tables:', 'yellow')
         for table in tables:
@@ -0,0 +1,152 @@
+"""
+Test Backend API
+Regression checks for FitFriendsClub endpoints that touch the database and disk
+"""
+
+import hashlib
+import os
+import sys
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+# Add backend directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import app as backend
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client backed by a fresh SQLite database and uploads folder"""
+    # The database and uploads folder are relative paths; run in a scratch dir
+    monkeypatch.chdir(tmp_path)
+    backend.init_database()
+    yield backend.app.test_client()
+
+    conn = getattr(backend._thread_local, "sqlite_conn", None)
+    if conn is not None:
+        conn.close()
+        backend._thread_local.sqlite_conn = None
+
+
+def create_user(username, password_hash):
+    """Insert a user row directly and return its id"""
+    conn = backend.get_sqlite_connection()
+    cursor = conn.execute(
+        """
+        INSERT INTO users (username, email, password_hash, full_name)
+        VALUES (?, ?, ?, ?)
+    """,
+        (username, f"{username}@example.com", password_hash, username.title()),
+    )
+    conn.commit()
+    return cursor.lastrowid
+
+
+def auth_header(user_id, username):
+    """Authorization header carrying a fresh token for the user"""
+    return {"Authorization": f"Bearer {backend.generate_token(user_id, username)}"}
+
+
+def create_test_image(size=(320, 240), color=(100, 150, 200)):
+    """Create a JPEG to upload"""
+    output = BytesIO()
+    Image.new("RGB", size, color).save(output, format="JPEG")
+    return output.getvalue()
+
+
+def upload_photo(client, headers, image_data):
+    """Upload a workout photo and return the JSON response"""
+    response = client.post(
+        "/api/upload-workout-photo",
+        data={"image": (BytesIO(image_data), "photo.jpg")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_deleting_duplicate_upload_keeps_shared_files(client):
+    """Deleting one of two identical uploads leaves the other photo's files"""
+    user_id = create_user("sam", backend.hash_password("secret"))
+    headers = auth_header(user_id, "sam")
+    image_data = create_test_image()
+
+    first = upload_photo(client, headers, image_data)
+    second = upload_photo(client, headers, image_data)
+    assert first["image_path"] == second["image_path"]
+    assert first["image_path"].startswith(f"workout_photo_{user_id}_")
+
+    response = client.delete(f"/api/delete-photo/{first['photo_id']}", headers=headers)
+    assert response.status_code == 200
+
+    for filename in (second["image_path"], second["thumbnail"]):
+        assert os.path.exists(os.path.join(backend.UPLOAD_FOLDER, filename))
+
+    # Once the last photo using them is deleted, the files go too
+    response = client.delete(f"/api/delete-photo/{second['photo_id']}", headers=headers)
+    assert response.status_code == 200
+    for filename in (second["image_path"], second["thumbnail"]):
+        assert not os.path.exists(os.path.join(backend.UPLOAD_FOLDER, filename))
+
+
+def test_identical_uploads_are_not_shared_between_users(client):
+    """The same bytes from two users are stored under separate files"""
+    image_data = create_test_image()
+    paths = []
+    for username in ("sam", "alex"):
+        user_id = create_user(username, backend.hash_password("secret"))
+        paths.append(
+            upload_photo(client, auth_header(user_id, username), image_data)[
+                "image_path"
+            ]
+        )
+
+    assert paths[0] != paths[1]
+
+
+def login(client, username, password):
+    """Post credentials to the login endpoint"""
+    return client.post("/api/login", json={"username": username, "password": password})
+
+
+def stored_password_hash(user_id):
+    """Read a user's stored password hash"""
+    conn = backend.get_sqlite_connection()
+    return conn.execute(
+        "SELECT password_hash FROM users WHERE id = ?", (user_id,)
+    ).fetchone()[0]
+
+
+def test_login_upgrades_legacy_sha256_hash(client):
+    """A correct password against a legacy SHA-256 hash logs in and is rehashed"""
+    legacy_hash = hashlib.sha256(b"secret").hexdigest()
+    user_id = create_user("sam", legacy_hash)
+
+    response = login(client, "sam", "secret")
+    assert response.status_code == 200
+    assert response.get_json()["token"]
+
+    upgraded_hash = stored_password_hash(user_id)
+    assert upgraded_hash.startswith("$argon2id$")
+    assert backend.verify_password("secret", upgraded_hash)
+
+    # The upgraded hash keeps working
+    assert login(client, "sam", "secret").status_code == 200
+
+
+@pytest.mark.parametrize(
+    "password_hash",
+    [hashlib.sha256(b"secret").hexdigest(), backend.hash_password("secret")],
+    ids=["legacy-sha256", "argon2"],
+)
+def test_login_rejects_wrong_password(client, password_hash):
+    """A wrong password is rejected and leaves the stored hash untouched"""
+    user_id = create_user("sam", password_hash)
+
+    response = login(client, "sam", "not-the-password")
+    assert response.status_code == 401
+    assert stored_password_hash(user_id) == password_hash
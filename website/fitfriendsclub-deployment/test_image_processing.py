@@ -6,13 +6,20 @@ Quick validation of FitFriendsClub image processing features
 import os
 import sys
 from io import BytesIO
-from PIL import Image
+from PIL import Image, UnidentifiedImageError
+
+try:
+    import cv2  # Optional: encodes the synthetic fixtures much faster
+    import numpy as np
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
 
 # Add backend directory to path
 sys.path.append('backend')
 
 try:
-    from image_utils import ImageProcessor, save_image_to_disk
+    from image_utils import ImageProcessor, save_image_to_disk, load_image_mmap
     print("✅ Successfully imported image_utils")
 except ImportError as e:
     print(f"❌ Import error: {e}")
@@ -21,6 +28,13 @@ except ImportError as e:
 
 def create_test_image(size=(800, 600), color=(100, 150, 200)):
     """Create a test image for processing"""
+    if CV2_AVAILABLE:
+        # OpenCV expects BGR channel order; quality 75 matches Pillow's default
+        pixels = np.full((size[1], size[0], 3), color[::-1], dtype=np.uint8)
+        ok, encoded = cv2.imencode('.jpg', pixels, [cv2.IMWRITE_JPEG_QUALITY, 75])
+        if ok:
+            return encoded.tobytes()
+
     image = Image.new('RGB', size, color)
     output = BytesIO()
     image.save(output, format='JPEG')
@@ -112,12 +126,43 @@ def test_file_operations():
         print(f"   File operations: ❌ {e}")
 
 
+def test_mmap_loading():
+    """Test memory-mapped loading of stored images"""
+    print("\n🗺️  Testing memory-mapped image loading...")
+    
+    filepath = save_image_to_disk(
+        create_test_image((120, 80)), "test_mmap_image.jpg", "backend/uploads"
+    )
+    empty_path = os.path.join("backend/uploads", "test_mmap_empty.jpg")
+    open(empty_path, "wb").close()
+    
+    try:
+        with load_image_mmap(filepath) as image:
+            source = image.fp
+            image.load()
+            assert image.size == (120, 80)
+        assert source.closed, "memory map left open"
+        print("   Load and unmap: ✅ 120x80, map closed on exit")
+        
+        try:
+            with load_image_mmap(empty_path):
+                pass
+            raise AssertionError("empty file accepted as an image")
+        except UnidentifiedImageError:
+            print("   Empty file: ✅ rejected as not an image")
+    
+    finally:
+        os.remove(filepath)
+        os.remove(empty_path)
+
+
 if __name__ == "__main__":
     print("🖼️  FitFriendsClub Image Processing Test Suite")
     print("=" * 50)
     
     test_image_processing()
     test_file_operations()
+    test_mmap_loading()
     
     print("\n✨ All tests completed!")
     print("\nReady for:")
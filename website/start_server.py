@@ -5,7 +5,6 @@ Run this to view your website locally at http://localhost:8000
 """
 
 import http.server
-import socketserver
 import os
 import webbrowser
 import threading
@@ -24,6 +23,11 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header('X-XSS-Protection', '1; mode=block')
         super().end_headers()
 
+    def copyfile(self, source, outputfile):
+        # Zero-copy transfer with os.sendfile; socket.sendfile falls back to
+        # send() on its own where sendfile isn't available
+        self.connection.sendfile(source)
+
 def open_browser():
     """Open browser after server starts"""
     time.sleep(1)
@@ -42,7 +46,8 @@ def main():
     browser_thread.start()
     
     try:
-        with socketserver.TCPServer(("", PORT), CustomHTTPRequestHandler) as httpd:
+        # One thread per request (daemon threads, so Ctrl+C exits at once)
+        with http.server.ThreadingHTTPServer(("", PORT), CustomHTTPRequestHandler) as httpd:
             print(f"✅ Server running at http://localhost:{PORT}/")
             print("🎉 Your FitFriendsClub website is now live!\n")
             print("Features to test:")
@@ -4,52 +4,202 @@ WeFit Brand Availability Research Tool
 Comprehensive check for domain, social media, app store, and trademark availability
 """
 
-import requests
+import argparse
+import asyncio
 import json
+import socket
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import chain, product
+from urllib.parse import quote_plus
+
+try:
+    import orjson  # Optional: much faster JSON serialization
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+_SEP = "=" * 60
+
+# (priority, domain) pairs, in report order; priority 0 are the headline
+# domains, the first of them being the one the brand question hinges on
+_DOMAINS = (
+    (0, "wefit.com"),
+    (0, "wefit.app"),
+    (1, "wefit.io"),
+    (1, "wefit.net"),
+    (1, "wefit.org"),
+    (1, "wefit.ai"),
+    (1, "we-fit.com"),
+    (1, "wefitness.com"),
+    (1, "wefit.co"),
+)
+_PRIMARY_DOMAIN = _DOMAINS[0][1]
+
+# Registry WHOIS servers (TCP port 43) by TLD, for authoritative answers
+_WHOIS_SERVERS = {
+    "com": "whois.verisign-grs.com",
+    "net": "whois.verisign-grs.com",
+    "org": "whois.pir.org",
+    "app": "whois.nic.google",
+    "io": "whois.nic.io",
+    "ai": "whois.nic.ai",
+    "co": "whois.nic.co",
+}
+
+# Lower-cased phrases registries use for an unregistered domain
+_WHOIS_NOT_FOUND = (b"no match", b"not found", b"no data found", b"no entries found")
+
+# Constant (name, value) tables, built once at import
+_PLATFORMS = (
+    ("Instagram", "https://www.instagram.com/"),
+    ("Twitter/X", "https://twitter.com/"),
+    ("TikTok", "https://www.tiktok.com/@"),
+    ("YouTube", "https://www.youtube.com/@"),
+    ("Facebook", "https://www.facebook.com/"),
+)
+
+# Platform column prefixes, padded once instead of on every handle
+_PLATFORM_LINES = tuple(("      " + platform.ljust(12) + " - ", base_url) for platform, base_url in _PLATFORMS)
+
+_APP_STORES = (
+    ("iOS App Store", "https://apps.apple.com/search?term="),
+    ("Google Play", "https://play.google.com/store/search?q="),
+    ("Microsoft Store", "https://www.microsoft.com/en-us/search/shop/apps?q="),
+)
+
+_TRADEMARK_RESOURCES = (
+    ("USPTO (US)", "https://www.uspto.gov/trademarks/search"),
+    ("EUIPO (EU)", "https://euipo.europa.eu/eSearch/"),
+    ("WIPO Global", "https://www.wipo.int/branddb/en/"),
+    ("Trademarkia", "https://www.trademarkia.com/"),
+    ("TMView", "https://www.tmdn.org/tmview/"),
+)
+
+_COMPETITORS = (
+    ("MyFitnessPal", "Established, long name, individual focus"),
+    ("Strava", "Athletic, social, but running-focused"),
+    ("Nike Training", "Brand-dependent, equipment-focused"),
+    ("Peloton", "Premium, hardware-dependent"),
+    ("Noom", "Weight-loss focused, not family"),
+    ("Fitbit", "Device-dependent, individual tracking"),
+)
+
+# getaddrinfo and WHOIS sockets block, so even under asyncio they run on
+# resolver threads
+_DNS_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="dns")
+
+def banner(title):
+    """Format a section banner"""
+    return f"\n{_SEP}\n🔍 {title}\n{_SEP}"
 
 def print_banner(title):
     """Print a formatted banner"""
-    print("\n" + "="*60)
-    print(f"🔍 {title}")
-    print("="*60)
+    print(banner(title))
 
-def check_domain_availability():
+@lru_cache(maxsize=256)
+def _resolve(host):
+    """Resolve a host to (addresses, error); addresses is empty on failure
+
+    Every DNS lookup in this module goes through here, so each host is
+    resolved once for the life of the process; long-running callers can
+    call _resolve.cache_clear() to re-check.
+    """
+    try:
+        infos = socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+    except Exception as e:
+        return (), e
+    return tuple(sorted({info[4][0] for info in infos})), None
+
+def _probe(domain):
+    """Look a single domain up in DNS and describe its availability"""
+    # A DNS answer means the domain is registered (parked domains without a
+    # web server included); NXDOMAIN means it probably isn't
+    _, e = _resolve(domain)
+    if e is None:
+        status = "❌ TAKEN (Resolves in DNS)"
+    elif isinstance(e, socket.gaierror) and e.errno == socket.EAI_NONAME:
+        status = "✅ POTENTIALLY AVAILABLE (No DNS record)"
+    elif isinstance(e, socket.gaierror) and e.errno == socket.EAI_AGAIN:
+        status = "⚠️  TIMEOUT (DNS lookup failed, retry later)"
+    else:
+        status = f"❓ UNKNOWN ({str(e)[:30]}...)"
+    return domain, status
+
+@lru_cache(maxsize=256)
+def _whois(domain):
+    """Ask the domain's registry over WHOIS, falling back to DNS on failure"""
+    server = _WHOIS_SERVERS.get(domain.rsplit(".", 1)[-1])
+    if server is None:
+        return _probe(domain)
+    try:
+        with socket.create_connection((server, 43), timeout=5) as sock:
+            sock.sendall(domain.encode("idna") + b"\r\n")
+            reply = b"".join(iter(partial(sock.recv, 4096), b"")).lower()
+    except OSError:
+        return _probe(domain)
+    
+    # A "Domain Name:" record settles it first, since not-found phrases can
+    # turn up in boilerplate on a registered domain's reply too. Without a
+    # record, only a not-found marker means available; anything else (rate
+    # limits, notices) settles nothing.
+    if b"domain name:" in reply:
+        return domain, "❌ TAKEN (Registered in WHOIS)"
+    if any(marker in reply for marker in _WHOIS_NOT_FOUND):
+        return domain, "✅ AVAILABLE (No WHOIS record)"
+    return _probe(domain)
+
+def _lookup(priority):
+    """Pick the check for a domain: WHOIS for headline domains, DNS otherwise"""
+    return _whois if priority == 0 else _probe
+
+async def _probe_all(domains):
+    """Probe every (priority, domain) pair concurrently from a single event loop"""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(loop.run_in_executor(_DNS_POOL, _lookup(priority), domain) for priority, domain in domains)
+    )
+
+async def _probe_fast(domains):
+    """Probe headline domains, skipping the rest once the primary one is settled"""
+    headline = [(priority, domain) for priority, domain in domains if priority == 0]
+    rest = [(priority, domain) for priority, domain in domains if priority != 0]
+    statuses = dict(await _probe_all(headline))
+    
+    # A timeout or unknown answer for the primary domain settles nothing, so
+    # only a definitive one lets the low-priority probes be skipped. They are
+    # submitted only after that, so skipping leaves no lookups running.
+    if statuses[_PRIMARY_DOMAIN].startswith(("❌", "✅")):
+        statuses.update((domain, "⏭️  SKIPPED (--fast)") for _, domain in rest)
+    else:
+        statuses.update(await _probe_all(rest))
+    return statuses
+
+def check_domain_availability(fast=False):
     """Check domain availability for WeFit"""
-    print_banner("WEFIT DOMAIN AVAILABILITY RESEARCH")
-    
-    domains_to_check = [
-        "wefit.com",
-        "wefit.app", 
-        "wefit.io",
-        "wefit.net",
-        "wefit.org",
-        "wefit.ai",
-        "we-fit.com",
-        "wefitness.com",
-        "wefit.co"
-    ]
+    lines = [banner("WEFIT DOMAIN AVAILABILITY RESEARCH")]
+    
+    lines.append("🌐 Checking Domain Availability:")
+    
+    # Probe all domains at once; the work is network-bound, so the total wait
+    # is the slowest probe rather than the sum of them
+    if fast:
+        statuses = asyncio.run(_probe_fast(_DOMAINS))
+    else:
+        statuses = dict(asyncio.run(_probe_all(_DOMAINS)))
+    
+    # Report in the original order so the output stays deterministic
+    for _, domain in _DOMAINS:
+        lines.append("   • " + domain.ljust(25) + " - " + statuses[domain])
     
-    print("🌐 Checking Domain Availability:")
-    
-    for domain in domains_to_check:
-        try:
-            # Using a simple HTTP request to check if domain resolves
-            response = requests.get(f"http://{domain}", timeout=5)
-            status = f"❌ TAKEN (Status: {response.status_code})"
-        except requests.exceptions.ConnectionError:
-            status = "✅ POTENTIALLY AVAILABLE (No response)"
-        except requests.exceptions.Timeout:
-            status = "⚠️  TIMEOUT (May be available)"
-        except Exception as e:
-            status = f"❓ UNKNOWN ({str(e)[:30]}...)"
-        
-        print(f"   • {domain:<25} - {status}")
+    return "\n".join(lines)
 
 def check_social_media_handles():
     """Check social media handle availability"""
-    print_banner("WEFIT SOCIAL MEDIA HANDLE RESEARCH")
+    lines = [banner("WEFIT SOCIAL MEDIA HANDLE RESEARCH")]
     
     handles = [
         "@WeFit",
@@ -59,30 +209,27 @@ def check_social_media_handles():
         "@WeFitAI"
     ]
     
-    platforms = {
-        "Instagram": "https://www.instagram.com/",
-        "Twitter/X": "https://twitter.com/", 
-        "TikTok": "https://www.tiktok.com/@",
-        "YouTube": "https://www.youtube.com/@",
-        "Facebook": "https://www.facebook.com/"
-    }
-    
-    print("📱 Social Media Handle Research:")
-    print("   (Note: Manual verification recommended)")
+    lines.append("📱 Social Media Handle Research:")
+    lines.append("   (Note: Manual verification recommended)")
     
-    for handle in handles:
-        print(f"\n   Handle: {handle}")
-        for platform, base_url in platforms.items():
+    # One flat pass over every (handle, platform) pair; product() yields them
+    # grouped by handle, so a header goes out whenever the handle changes
+    current = None
+    for handle, (prefix, base_url) in product(handles, _PLATFORM_LINES):
+        if handle != current:
+            current = handle
             clean_handle = handle.replace("@", "")
-            full_url = f"{base_url}{clean_handle}"
-            print(f"      {platform:<12} - {full_url}")
+            lines.append(f"\n   Handle: {handle}")
+        lines.append(prefix + base_url + clean_handle)
+    
+    return "\n".join(lines)
 
 def check_app_store_availability():
     """Research app store name conflicts"""
-    print_banner("WEFIT APP STORE RESEARCH")
+    lines = [banner("WEFIT APP STORE RESEARCH")]
     
-    print("📱 App Store Name Conflict Check:")
-    print("   Search terms to manually verify:")
+    lines.append("📱 App Store Name Conflict Check:")
+    lines.append("   Search terms to manually verify:")
     
     search_terms = [
         "WeFit",
@@ -91,36 +238,28 @@ def check_app_store_availability():
         "WeFit App"
     ]
     
-    app_stores = {
-        "iOS App Store": "https://apps.apple.com/search?term=",
-        "Google Play": "https://play.google.com/store/search?q=",
-        "Microsoft Store": "https://www.microsoft.com/en-us/search/shop/apps?q="
-    }
+    # Encode each term once, properly escaping anything beyond spaces
+    encoded = {term: quote_plus(term) for term in search_terms}
     
-    for term in search_terms:
-        print(f"\n   📋 Search Term: '{term}'")
-        for store, base_url in app_stores.items():
-            search_url = base_url + term.replace(" ", "%20")
-            print(f"      {store:<18} - {search_url}")
+    current = None
+    for term, (store, base_url) in product(search_terms, _APP_STORES):
+        if term != current:
+            current = term
+            lines.append(f"\n   📋 Search Term: '{term}'")
+        lines.append("      " + store.ljust(18) + " - " + base_url + encoded[term])
+    
+    return "\n".join(lines)
 
 def check_trademark_resources():
     """Provide trademark research resources"""
-    print_banner("WEFIT TRADEMARK RESEARCH RESOURCES")
+    lines = [banner("WEFIT TRADEMARK RESEARCH RESOURCES")]
     
-    print("⚖️  Trademark Databases to Check:")
+    lines.append("⚖️  Trademark Databases to Check:")
     
-    trademark_resources = {
-        "USPTO (US)": "https://www.uspto.gov/trademarks/search",
-        "EUIPO (EU)": "https://euipo.europa.eu/eSearch/",
-        "WIPO Global": "https://www.wipo.int/branddb/en/",
-        "Trademarkia": "https://www.trademarkia.com/",
-        "TMView": "https://www.tmdn.org/tmview/"
-    }
-    
-    for resource, url in trademark_resources.items():
-        print(f"   • {resource:<15} - {url}")
+    for resource, url in _TRADEMARK_RESOURCES:
+        lines.append("   • " + resource.ljust(15) + " - " + url)
     
-    print(f"\n   🔍 Search Terms to Use:")
+    lines.append(f"\n   🔍 Search Terms to Use:")
     search_terms = [
         "WeFit",
         "We Fit", 
@@ -129,9 +268,9 @@ def check_trademark_resources():
     ]
     
     for term in search_terms:
-        print(f"      • '{term}'")
+        lines.append(f"      • '{term}'")
     
-    print(f"\n   📋 Trademark Classes to Check:")
+    lines.append(f"\n   📋 Trademark Classes to Check:")
     relevant_classes = [
         "Class 09: Mobile apps, software",
         "Class 35: Business services, advertising", 
@@ -141,13 +280,15 @@ def check_trademark_resources():
     ]
     
     for tm_class in relevant_classes:
-        print(f"      • {tm_class}")
+        lines.append(f"      • {tm_class}")
+    
+    return "\n".join(lines)
 
 def analyze_wefit_brand():
     """Analyze WeFit as a brand name"""
-    print_banner("WEFIT BRAND ANALYSIS")
+    lines = [banner("WEFIT BRAND ANALYSIS")]
     
-    print("🎯 Brand Name Analysis: 'WeFit'")
+    lines.append("🎯 Brand Name Analysis: 'WeFit'")
     
     strengths = [
         "Short and memorable (5 letters)",
@@ -166,21 +307,45 @@ def analyze_wefit_brand():
         "May need variations for different markets"
     ]
     
-    print("\n   ✅ Brand Strengths:")
+    lines.append("\n   ✅ Brand Strengths:")
     for strength in strengths:
-        print(f"      • {strength}")
+        lines.append(f"      • {strength}")
     
-    print("\n   ⚠️  Potential Concerns:")
+    lines.append("\n   ⚠️  Potential Concerns:")
     for concern in concerns:
-        print(f"      • {concern}")
+        lines.append(f"      • {concern}")
+    
+    return "\n".join(lines)
+
+# Console lines for each report field, in report_data order; fields without
+# a renderer (e.g. "status") are left to the JSON file
+_REPORT_RENDERERS = {
+    "brand_name": lambda name: [f"   Brand Name: {name}"],
+    "research_date": lambda date: [f"   Research Date: {date}"],
+    "brand_assessment": lambda assessment: [f"   Brand Assessment: {assessment}"],
+    "priority_actions": lambda actions: [
+        "\n   🎯 Priority Actions:",
+        *(f"      {action}" for action in actions),
+    ],
+    "risk_assessment": lambda risks: [
+        "\n   ⚠️  Risk Assessment:",
+        *("      " + risk_type.replace('_', ' ').title().ljust(18) + " - " + risk_level
+          for risk_type, risk_level in risks.items()),
+    ],
+    "alternatives": lambda alternatives: [
+        "\n   🔄 Alternative Options:",
+        *(f"      • {alt}" for alt in alternatives),
+    ],
+}
 
-def generate_wefit_report():
+def generate_wefit_report(research_date=None):
     """Generate comprehensive WeFit availability report"""
-    print_banner("WEFIT BRAND AVAILABILITY REPORT")
+    if research_date is None:
+        research_date = datetime.now().strftime(TIMESTAMP_FORMAT)
     
     report_data = {
         "brand_name": "WeFit",
-        "research_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "research_date": research_date,
         "status": "Research Required",
         "brand_assessment": "Strong - Short, memorable, fitness-focused",
         "priority_actions": [
@@ -206,49 +371,37 @@ def generate_wefit_report():
         ]
     }
     
-    print("📊 Research Summary:")
-    print(f"   Brand Name: {report_data['brand_name']}")
-    print(f"   Research Date: {report_data['research_date']}")
-    print(f"   Brand Assessment: {report_data['brand_assessment']}")
-    
-    print(f"\n   🎯 Priority Actions:")
-    for action in report_data['priority_actions']:
-        print(f"      {action}")
-    
-    print(f"\n   ⚠️  Risk Assessment:")
-    for risk_type, risk_level in report_data['risk_assessment'].items():
-        print(f"      {risk_type.replace('_', ' ').title():<18} - {risk_level}")
-    
-    print(f"\n   🔄 Alternative Options:")
-    for alt in report_data['alternatives']:
-        print(f"      • {alt}")
-    
     # Save report to file
-    with open('wefit_availability_research.json', 'w') as f:
-        json.dump(report_data, f, indent=2)
-    
-    print(f"\n   💾 Detailed report saved to: wefit_availability_research.json")
+    # Serialize to bytes up front and write them in a single binary call
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(report_data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(report_data, indent=2).encode('utf-8')
+    with open('wefit_availability_research.json', 'wb') as f:
+        f.write(payload)
+    
+    # The whole summary as one string, from a single pass over report_data
+    return "\n".join([
+        banner("WEFIT BRAND AVAILABILITY REPORT"),
+        "📊 Research Summary:",
+        *chain.from_iterable(
+            _REPORT_RENDERERS[key](value)
+            for key, value in report_data.items() if key in _REPORT_RENDERERS
+        ),
+        "\n   💾 Detailed report saved to: wefit_availability_research.json",
+    ])
 
 def wefit_vs_competitors():
     """Compare WeFit to other fitness app names"""
-    print_banner("WEFIT COMPETITIVE POSITIONING")
-    
-    print("🏆 WeFit vs Major Fitness Apps:")
+    lines = [banner("WEFIT COMPETITIVE POSITIONING")]
     
-    competitors = {
-        "MyFitnessPal": "Established, long name, individual focus",
-        "Strava": "Athletic, social, but running-focused", 
-        "Nike Training": "Brand-dependent, equipment-focused",
-        "Peloton": "Premium, hardware-dependent",
-        "Noom": "Weight-loss focused, not family",
-        "Fitbit": "Device-dependent, individual tracking"
-    }
+    lines.append("🏆 WeFit vs Major Fitness Apps:")
     
-    print("\n   📊 Competitive Landscape:")
-    for competitor, description in competitors.items():
-        print(f"      {competitor:<15} - {description}")
+    lines.append("\n   📊 Competitive Landscape:")
+    for competitor, description in _COMPETITORS:
+        lines.append("      " + competitor.ljust(15) + " - " + description)
     
-    print(f"\n   🎯 WeFit Competitive Advantages:")
+    lines.append(f"\n   🎯 WeFit Competitive Advantages:")
     advantages = [
         "Shorter name than most competitors",
         "Family/community focus (underserved market)",
@@ -259,30 +412,60 @@ def wefit_vs_competitors():
     ]
     
     for advantage in advantages:
-        print(f"      ✅ {advantage}")
+        lines.append(f"      ✅ {advantage}")
+    
+    return "\n".join(lines)
+
+# Research sections by CLI name, in report order
+SECTIONS = {
+    'domains': check_domain_availability,
+    'social': check_social_media_handles,
+    'apps': check_app_store_availability,
+    'tm': check_trademark_resources,
+    'brand': analyze_wefit_brand,
+    'report': generate_wefit_report,
+    'compete': wefit_vs_competitors,
+}
 
-def main():
+def main(argv=None):
     """Run complete WeFit availability research"""
+    parser = argparse.ArgumentParser(description="WeFit brand availability research")
+    parser.add_argument('--fast', action='store_true',
+                        help="skip low-priority domains once the primary domain is settled")
+    parser.add_argument('--sections', nargs='+', choices=list(SECTIONS), default=list(SECTIONS),
+                        metavar='SECTION',
+                        help="sections to run (default: all): %(choices)s")
+    args = parser.parse_args(argv)
+    
     print_banner("WEFIT BRAND AVAILABILITY RESEARCH")
-    print(f"🕒 Research started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    started_at = datetime.now().strftime(TIMESTAMP_FORMAT)
+    print(f"🕒 Research started at: {started_at}")
     print(f"🎯 Target Brand: 'WeFit'")
     print(f"🔍 Research Scope: Domains, Social Media, App Stores, Trademarks, Brand Analysis")
     
-    # Run all research functions
-    check_domain_availability()
-    check_social_media_handles() 
-    check_app_store_availability()
-    check_trademark_resources()
-    analyze_wefit_brand()
-    generate_wefit_report()
-    wefit_vs_competitors()
+    # Run all research sections at once: only the domain check waits on the
+    # network, so the rest finish while it runs. Each section returns its
+    # text, which is printed in a fixed order once everything is done.
+    # The report is dated with the run's start time, not a clock read of its own
+    options = {
+        check_domain_availability: {"fast": args.fast},
+        generate_wefit_report: {"research_date": started_at},
+    }
+    # Unselected sections are never called; selected ones keep report order
+    runners = [
+        partial(section, **options.get(section, {}))
+        for name, section in SECTIONS.items() if name in args.sections
+    ]
+    with ThreadPoolExecutor(max_workers=len(runners)) as executor:
+        results = list(executor.map(lambda run: run(), runners))
+    print("\n".join(results))
     
     print_banner("WEFIT RESEARCH COMPLETE")
     print("🎉 WeFit brand research completed!")
     print("💡 Initial assessment: WeFit appears more promising than TogetherFit")
     print("⭐ Strong brand potential: Short, memorable, family-fitness focused")
     print("⚠️  Still requires manual verification of key domains and trademarks")
-    print(f"🕒 Research completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🕒 Research completed at: {datetime.now().strftime(TIMESTAMP_FORMAT)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file